@@ -2,12 +2,112 @@ import sys
 import json
 import re
 import os
+import hashlib
+import hmac
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from operator import itemgetter, methodcaller
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _dumps_line(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+
+    def _dumps_line(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+_PASSWORD_RE = re.compile(r'\A[A-Za-z0-9]+\Z')
+_PBKDF2_ITERATIONS = 100_000
+_SEARCH_CACHE_SIZE = 32
+_SORT_CACHE_SIZE = 4
+_DESCRIPTION_ROLE = Qt.ItemDataRole.UserRole.value + 1
+_RATING_ROLE = Qt.ItemDataRole.UserRole.value + 2
+_DEFAULT_MENU_SIZE = QSize(100, 80)
+_REQUIRED_FIELDS = (
+    ('first_name', "Имя"),
+    ('last_name', "Фамилия"),
+    ('email', "Email"),
+    ('login', "Логин"),
+    ('password', "Пароль"),
+    ('repeat_password', "Повторите пароль"),
+    ('address', "Адрес доставки")
+)
+
+_MAIN_STYLESHEET = """
+    QMainWindow { background-color: #f8f9fa; }
+    QWidget { font-family: 'Segoe UI'; font-size: 12pt; }
+    QPushButton {
+        background-color: #4CAF50; color: white; border-radius: 8px;
+        padding: 10px 20px; font-weight: bold; border: none; font-size: 12pt;
+    }
+    QPushButton:hover { background-color: #45a049; }
+    QPushButton#secondary { background-color: #2196F3; }
+    QPushButton#secondary:hover { background-color: #0b7dda; }
+    QPushButton#danger { background-color: #f44336; }
+    QPushButton#danger:hover { background-color: #d32f2f; }
+    QLineEdit, QComboBox, QDateEdit {
+        padding: 10px; border: 1px solid #ddd; border-radius: 6px; font-size: 12pt;
+    }
+    QLabel { color: #333; font-size: 12pt; }
+    QListWidget, QListView {
+        background-color: white; border: 1px solid #ddd; border-radius: 8px; font-size: 11pt;
+    }
+    QFrame#header { background-color: #4CAF50; border: none; padding: 15px; }
+    QFrame#card {
+        background-color: white; border-radius: 10px; padding: 15px; border: 1px solid #e0e0e0;
+    }
+    QLabel#title { font-size: 24pt; font-weight: bold; color: white; }
+    QLabel#section { font-size: 16pt; font-weight: bold; color: #333; padding: 10px 0; }
+"""
+
+def _hash_password(password, salt=None):
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, _PBKDF2_ITERATIONS)
+    return {'salt': salt.hex(), 'hash': digest.hex()}
+
+def _verify_password(password, stored):
+    expected = _hash_password(password, bytes.fromhex(stored['salt']))
+    return hmac.compare_digest(expected['hash'], stored['hash'])
+
+def _write_placeholder_icon(path):
+    img = QImage(100, 100, QImage.Format.Format_RGB32)
+    img.fill(QColor(73, 109, 137))
+    painter = QPainter(img)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.fillRect(20, 20, 61, 61, QColor(255, 165, 0))
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(255, 255, 255))
+    painter.drawEllipse(30, 30, 41, 41)
+    painter.end()
+    img.save(path)
+
+def _public_fields(data):
+    if isinstance(data, dict):
+        return {k: _public_fields(v) for k, v in data.items() if not k.startswith('_')}
+    if isinstance(data, list):
+        return [_public_fields(v) for v in data]
+    return data
+
 class Database:
     _instance = None
 
@@ -18,42 +118,200 @@ class Database:
         return cls._instance
 
     def _init_database(self):
-        self.users_file = "users.json"
+        self.users_file = "users.jsonl"
+        self.legacy_users_file = "users.json"
         self.restaurants_file = "restaurants.json"
-        self.orders_file = "orders.json"
+        self.orders_file = "orders.jsonl"
+        self.legacy_orders_file = "orders.json"
+        self.admin_seed_file = ".admin_seeded"
+        self._cache = {}
+        self._lock = threading.RLock()
+        self._trigram_index = {'restaurants': defaultdict(set), 'dishes': defaultdict(set)}
+        self._search_keys = []
+        self.restaurants_version = 0
+        self._users_by_login = {}
         self.initialize_files()
 
     def initialize_files(self):
-        for file in [self.users_file, self.restaurants_file, self.orders_file]:
-            if not os.path.exists(file):
-                with open(file, 'w') as f:
-                    json.dump([], f)
+        if not os.path.exists(self.restaurants_file):
+            with open(self.restaurants_file, 'wb') as f:
+                f.write(_dumps([]))
+        if not os.path.exists(self.users_file):
+            users = self._load_legacy(self.legacy_users_file)
+            for user in users:
+                if isinstance(user.get('password'), str):
+                    user['password'] = _hash_password(user['password'])
+            self._write_lines(self.users_file, users)
+            try:
+                os.remove(self.admin_seed_file)
+            except FileNotFoundError:
+                pass
+        if not os.path.exists(self.orders_file):
+            self._write_lines(self.orders_file, self._load_legacy(self.legacy_orders_file))
+
+    def _load_legacy(self, path):
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            return _loads(f.read())
+
+    def _load(self, path, on_reload=None, check_mtime=True):
+        entry = self._cache.get(path)
+        if entry and not check_mtime:
+            return entry[1]
+        mtime = os.stat(path).st_mtime_ns
+        if entry and entry[0] == mtime:
+            return entry[1]
+        if path.endswith('.jsonl'):
+            data = list(self._iter_lines(path))
+        else:
+            with open(path, 'rb') as f:
+                data = _loads(f.read())
+        apply_index = on_reload(data) if on_reload else None
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry and entry[0] == mtime:
+                return entry[1]
+            if apply_index:
+                apply_index()
+            self._cache[path] = (mtime, data)
+        return data
+
+    def _save(self, path, data, on_reload=None):
+        with self._lock:
+            if path.endswith('.jsonl'):
+                self._write_lines(path, data)
+            else:
+                with open(path, 'wb') as f:
+                    f.write(_dumps(_public_fields(data)))
+                    f.flush()
+                    os.fsync(f.fileno())
+            if on_reload:
+                on_reload(data)()
+            self._cache[path] = (os.stat(path).st_mtime_ns, data)
+
+    def _iter_lines(self, path):
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+
+    def _append_line(self, path, row):
+        with self._lock, open(path, 'ab') as f:
+            f.write(_dumps_line(_public_fields(row)) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_lines(self, path, rows):
+        tmp_path = path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                f.writelines(_dumps_line(row) + b'\n' for row in _public_fields(rows))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+    def _index_users(self, users):
+        users_by_login = {u['login']: u for u in users}
+
+        def apply():
+            self._users_by_login = users_by_login
+        return apply
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _index_restaurants(self, restaurants):
+        index = {'restaurants': defaultdict(set), 'dishes': defaultdict(set)}
+        keys = []
+        for i, restaurant in enumerate(restaurants):
+            restaurant['_haystack_lc'] = f"{restaurant['name']} {restaurant['description']}".lower()
+            restaurant['_rating_str'] = f"★ {restaurant.get('rating', 4.5)}"
+            restaurant['_display'] = (
+                f"🍴 Ресторан: {restaurant['name']}\n"
+                f"{restaurant['description']}\n"
+                f"Рейтинг: {restaurant['_rating_str']}"
+            )
+            for gram in self._trigrams(restaurant['_haystack_lc']):
+                index['restaurants'][gram].add(i)
+            keys.append((i, -1))
+            for j, item in enumerate(restaurant['menu']):
+                item['_haystack_lc'] = item['name'].lower()
+                item['_display'] = (
+                    f"🍲 Блюдо: {item['name']} - {item['price']:.2f} ₽\n"
+                    f"Ресторан: {restaurant['name']}\n"
+                    f"{item['description']}"
+                )
+                for gram in self._trigrams(item['_haystack_lc']):
+                    index['dishes'][gram].add((i, j))
+                keys.append((i, j))
+
+        def apply():
+            self._trigram_index = index
+            self._search_keys = keys
+            self.restaurants_version += 1
+        return apply
+
+    def search_candidates(self, tokens):
+        with self._lock:
+            restaurants = self.load_restaurants(check_mtime=False)
+            grams = set().union(*(self._trigrams(token) for token in tokens))
+            if not grams:
+                return restaurants, self._search_keys
+            restaurant_lists = [self._trigram_index['restaurants'].get(gram, set()) for gram in grams]
+            dish_lists = [self._trigram_index['dishes'].get(gram, set()) for gram in grams]
+            candidates = {(i, -1) for i in set.intersection(*restaurant_lists)}
+            candidates.update(set.intersection(*dish_lists))
+            return restaurants, sorted(candidates)
 
     def load_users(self):
-        with open(self.users_file, 'r') as f:
-            return json.load(f)
+        return self._load(self.users_file, self._index_users)
 
     def save_users(self, users):
-        with open(self.users_file, 'w') as f:
-            json.dump(users, f, indent=2)
+        self._save(self.users_file, users, self._index_users)
 
-    def load_restaurants(self):
-        with open(self.restaurants_file, 'r') as f:
-            return json.load(f)
+    def append_user(self, user):
+        with self._lock:
+            users = self.load_users()
+            self._append_line(self.users_file, user)
+            users.append(user)
+            self._users_by_login[user['login']] = user
+            self._cache[self.users_file] = (os.stat(self.users_file).st_mtime_ns, users)
+
+    def login_exists(self, login):
+        self.load_users()
+        return login in self._users_by_login
+
+    def get_user_by_login(self, login):
+        self.load_users()
+        return self._users_by_login.get(login)
+
+    def load_restaurants(self, check_mtime=True):
+        return self._load(self.restaurants_file, self._index_restaurants, check_mtime)
+
+    def restaurants_snapshot(self):
+        with self._lock:
+            return self.load_restaurants(check_mtime=False), self.restaurants_version
 
     def save_restaurants(self, restaurants):
-        with open(self.restaurants_file, 'w') as f:
-            json.dump(restaurants, f, indent=2)
-            
+        self._save(self.restaurants_file, restaurants, self._index_restaurants)
+
+    def iter_orders(self):
+        return self._iter_lines(self.orders_file)
+
     def load_orders(self):
-        with open(self.orders_file, 'r') as f:
-            return json.load(f)
-            
+        return list(self.iter_orders())
+
     def save_orders(self, orders):
-        with open(self.orders_file, 'w') as f:
-            json.dump(orders, f, indent=2)
+        self._write_lines(self.orders_file, orders)
+
+    def append_order(self, order):
+        self._append_line(self.orders_file, order)
 
 class AbstractUser(ABC):
+    __slots__ = ('first_name', 'last_name', 'birth_date', 'email', 'login', 'password', 'address', 'role')
+
     def __init__(self, data):
         self.first_name = data['first_name']
         self.last_name = data['last_name']
@@ -65,10 +323,10 @@ class AbstractUser(ABC):
         self.role = data.get('role', 'user')
 
 class RegularUser(AbstractUser):
-    pass
+    __slots__ = ()
 
 class AdminUser(AbstractUser):
-    pass
+    __slots__ = ()
 
 class UserCreator(ABC):
     @abstractmethod
@@ -89,25 +347,33 @@ class UserSystemFacade:
         self.regular_creator = RegularUserCreator()
         self.admin_creator = AdminUserCreator()
 
-    def register_user(self, user_data):
-        users = self.db.load_users()
-        if any(u['login'] == user_data['login'] for u in users):
+    def register_user(self, registration):
+        if self.db.login_exists(registration.login):
             return False, "Логин уже существует"
-        if user_data['password'] != user_data['repeat_password']:
+        if registration.password != registration.repeat_password:
             return False, "Пароли не совпадают"
-        if not re.match(r'^[A-Za-z0-9]+$', user_data['password']):
+        if not _PASSWORD_RE.match(registration.password):
             return False, "Пароль должен содержать только латинские буквы и цифры"
+        user_data = asdict(registration)
         user_data.pop('repeat_password')
+        user_data['password'] = _hash_password(registration.password)
         user_data['role'] = 'user'
-        users.append(user_data)
-        self.db.save_users(users)
+        self.db.append_user(user_data)
         return True, "Регистрация прошла успешно"
 
     def login_user(self, login, password):
-        users = self.db.load_users()
-        user_data = next((u for u in users if u['login'] == login and u['password'] == password), None)
+        user_data = self.db.get_user_by_login(login)
         if not user_data:
             return None
+        stored = user_data['password']
+        if isinstance(stored, str):
+            # plaintext record from before hashing: check once, then store a hash
+            if not hmac.compare_digest(stored.encode(), password.encode()):
+                return None
+            user_data['password'] = _hash_password(password)
+            self.db.save_users(self.db.load_users())
+        elif not _verify_password(password, stored):
+            return None
         if user_data.get('role') == 'admin':
             return self.admin_creator.create_user(user_data)
         else:
@@ -136,53 +402,16 @@ class SearchSubject(Subject):
         self.results = results
         self.notify(results)
 
-class UserBuilder:
-    def __init__(self):
-        self.user_data = {
-            'first_name': '',
-            'last_name': '',
-            'birth_date': '',
-            'email': '',
-            'login': '',
-            'password': '',
-            'repeat_password': '',
-            'address': ''
-        }
-
-    def set_first_name(self, first_name):
-        self.user_data['first_name'] = first_name
-        return self
-
-    def set_last_name(self, last_name):
-        self.user_data['last_name'] = last_name
-        return self
-
-    def set_birth_date(self, birth_date):
-        self.user_data['birth_date'] = birth_date
-        return self
-
-    def set_email(self, email):
-        self.user_data['email'] = email
-        return self
-
-    def set_login(self, login):
-        self.user_data['login'] = login
-        return self
-
-    def set_password(self, password):
-        self.user_data['password'] = password
-        return self
-
-    def set_repeat_password(self, repeat_password):
-        self.user_data['repeat_password'] = repeat_password
-        return self
-
-    def set_address(self, address):
-        self.user_data['address'] = address
-        return self
-
-    def build(self):
-        return self.user_data
+@dataclass(slots=True)
+class UserRegistration:
+    first_name: str = ''
+    last_name: str = ''
+    birth_date: str = ''
+    email: str = ''
+    login: str = ''
+    password: str = ''
+    repeat_password: str = ''
+    address: str = ''
 
 class SortStrategy(ABC):
     @abstractmethod
@@ -191,23 +420,35 @@ class SortStrategy(ABC):
 
 class SortByName(SortStrategy):
     def sort(self, items):
-        return sorted(items, key=lambda x: x['name'])
+        return sorted(items, key=itemgetter('name'))
 
 class SortByRating(SortStrategy):
     def sort(self, items):
-        return sorted(items, key=lambda x: x.get('rating', 4.0), reverse=True)
+        return sorted(items, key=methodcaller('get', 'rating', 4.0), reverse=True)
 
 class SortContext:
     def __init__(self, strategy):
         self._strategy = strategy
+        self._cache = OrderedDict()
 
     def set_strategy(self, strategy):
         self._strategy = strategy
 
     def execute_sort(self, items):
-        return self._strategy.sort(items)
+        key = (type(self._strategy), tuple(map(id, items)))
+        result = self._cache.get(key)
+        if result is None:
+            result = self._strategy.sort(items)
+            self._cache[key] = result
+            if len(self._cache) > _SORT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return result
 
 class Restaurant:
+    __slots__ = ('id', 'name', 'description', 'rating', 'menu')
+
     def __init__(self, data):
         self.id = data['id']
         self.name = data['name']
@@ -216,6 +457,8 @@ class Restaurant:
         self.menu = [MenuItem(item) for item in data['menu']]
 
 class MenuItem:
+    __slots__ = ('id', 'name', 'description', 'price', 'category')
+
     def __init__(self, data):
         self.id = data['id']
         self.name = data['name']
@@ -223,46 +466,120 @@ class MenuItem:
         self.price = data['price']
         self.category = data.get('category', 'Основное блюдо')
 
+class SearchResultsModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        display, user_data = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return display
+        if role == Qt.ItemDataRole.UserRole:
+            return user_data
+        if role == Qt.ItemDataRole.SizeHintRole:
+            return QSize(100, 100)
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+class RestaurantDelegate(QStyledItemDelegate):
+    def __init__(self, pixmap, parent=None):
+        super().__init__(parent)
+        self.pixmap = pixmap
+        self.name_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
+        self.desc_font = QFont("Segoe UI", 12)
+        self.rating_font = QFont("Segoe UI", 12, QFont.Weight.Bold)
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        rect = option.rect.adjusted(10, 10, -10, -10)
+        painter.save()
+        painter.drawPixmap(rect.left(), rect.top(), self.pixmap)
+        text_rect = rect.adjusted(90, 0, 0, 0)
+
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#333"))
+        drawn = painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                                 index.data(Qt.ItemDataRole.DisplayRole))
+        text_rect.setTop(drawn.bottom() + 4)
+
+        painter.setFont(self.desc_font)
+        painter.setPen(QColor("#555"))
+        drawn = painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.TextFlag.TextWordWrap,
+                                 index.data(_DESCRIPTION_ROLE))
+        text_rect.setTop(drawn.bottom() + 4)
+
+        painter.setFont(self.rating_font)
+        painter.setPen(QColor("#FF9800"))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft, index.data(_RATING_ROLE))
+        painter.restore()
+
+class DBWorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+class DBWorker(QRunnable):
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = DBWorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except (OSError, ValueError) as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
 class FoodDeliveryApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("FoodExpress - Доставка вкусной еды")
         self.setGeometry(100, 100, 1200, 800)
-        self.setStyleSheet("""
-            QMainWindow { background-color: #f8f9fa; }
-            QWidget { font-family: 'Segoe UI'; font-size: 12pt; }
-            QPushButton {
-                background-color: #4CAF50; color: white; border-radius: 8px;
-                padding: 10px 20px; font-weight: bold; border: none; font-size: 12pt;
-            }
-            QPushButton:hover { background-color: #45a049; }
-            QPushButton#secondary { background-color: #2196F3; }
-            QPushButton#secondary:hover { background-color: #0b7dda; }
-            QPushButton#danger { background-color: #f44336; }
-            QPushButton#danger:hover { background-color: #d32f2f; }
-            QLineEdit, QComboBox, QDateEdit {
-                padding: 10px; border: 1px solid #ddd; border-radius: 6px; font-size: 12pt;
-            }
-            QLabel { color: #333; font-size: 12pt; }
-            QListWidget {
-                background-color: white; border: 1px solid #ddd; border-radius: 8px; font-size: 11pt;
-            }
-            QFrame#header { background-color: #4CAF50; border: none; padding: 15px; }
-            QFrame#card {
-                background-color: white; border-radius: 10px; padding: 15px; border: 1px solid #e0e0e0;
-            }
-            QLabel#title { font-size: 24pt; font-weight: bold; color: white; }
-            QLabel#section { font-size: 16pt; font-weight: bold; color: #333; padding: 10px 0; }
-        """)
+        self.setStyleSheet(_MAIN_STYLESHEET)
         
         self.db = Database()
         self.user_system = UserSystemFacade()
         self.search_subject = SearchSubject()
         self.search_subject.attach(self)
+        self._last_query = None
+        self._restaurant_pixmap = QPixmap("restaurant_icon.png").scaled(
+            80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        self._search_cache = OrderedDict()
+        self._search_cache_version = None
         
         self.current_user = None
         self.current_restaurant = None
+        self._requested_restaurant_id = None
+        self._restaurant_objs = {}
+        self._restaurant_objs_version = None
+        self._menu_item_cache = {}
+        self._item_registry = {}
+        self.sort_context = SortContext(SortByName())
+        self._pending_menu = {}
         self.cart = []
+        self._cart_total = 0.0
+        self._cart_dirty = False
+        self._order_pending = False
+        self._default_birth_day = QDate.currentDate()
+        self._default_birth = self._default_birth_day.addYears(-18)
         
         self.init_ui()
         self.show_login()
@@ -378,7 +695,7 @@ class FoodDeliveryApp(QMainWindow):
         self.last_name_input = QLineEdit()
         self.birth_date_input = QDateEdit()
         self.birth_date_input.setCalendarPopup(True)
-        self.birth_date_input.setDate(QDate.currentDate().addYears(-18))
+        self.birth_date_input.setDate(self._default_birth)
         self.email_input = QLineEdit()
         self.login_input_reg = QLineEdit()
         self.password_input_reg = QLineEdit()
@@ -450,7 +767,12 @@ class FoodDeliveryApp(QMainWindow):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Поиск ресторанов или блюд...")
-        self.search_input.textChanged.connect(self.handle_search)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(180)
+        self._search_timer.timeout.connect(self.handle_search)
+        self.search_input.textChanged.connect(self._search_timer.start)
         
         search_btn = QPushButton("Поиск")
         search_btn.clicked.connect(self.handle_search)
@@ -470,9 +792,12 @@ class FoodDeliveryApp(QMainWindow):
         self.search_results_label.setObjectName("section")
         self.search_results_label.hide()
         
-        self.search_results_list = QListWidget()
+        self.search_results_model = SearchResultsModel(self)
+        self.search_results_list = QListView()
+        self.search_results_list.setModel(self.search_results_model)
+        self.search_results_list.setUniformItemSizes(True)
         self.search_results_list.hide()
-        self.search_results_list.itemClicked.connect(self.handle_search_result_click)
+        self.search_results_list.clicked.connect(self.handle_search_result_click)
         
         restaurant_section = QLabel("Популярные рестораны")
         restaurant_section.setObjectName("section")
@@ -481,6 +806,7 @@ class FoodDeliveryApp(QMainWindow):
         self.restaurant_list.setViewMode(QListWidget.ViewMode.ListMode)
         self.restaurant_list.setSpacing(15)
         self.restaurant_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.restaurant_list.setItemDelegate(RestaurantDelegate(self._restaurant_pixmap, self.restaurant_list))
         self.restaurant_list.itemClicked.connect(self.show_restaurant)
         
         layout.addWidget(self.search_results_label)
@@ -520,6 +846,7 @@ class FoodDeliveryApp(QMainWindow):
         layout.addWidget(header)
         
         self.menu_tabs = QTabWidget()
+        self.menu_tabs.currentChanged.connect(self._populate_menu_tab)
         layout.addWidget(self.menu_tabs)
         
         page.setLayout(layout)
@@ -689,32 +1016,21 @@ class FoodDeliveryApp(QMainWindow):
             QMessageBox.warning(self, "Ошибка входа", "Неверный логин или пароль")
 
     def handle_register(self):
-        builder = UserBuilder()
-        user_data = (builder
-            .set_first_name(self.first_name_input.text())
-            .set_last_name(self.last_name_input.text())
-            .set_birth_date(self.birth_date_input.date().toString("yyyy-MM-dd"))
-            .set_email(self.email_input.text())
-            .set_login(self.login_input_reg.text())
-            .set_password(self.password_input_reg.text())
-            .set_repeat_password(self.repeat_password_input.text())
-            .set_address(self.address_input.text())
-            .build())
-        
-        required_fields = [
-            ('first_name', "Имя"),
-            ('last_name', "Фамилия"),
-            ('email', "Email"),
-            ('login', "Логин"),
-            ('password', "Пароль"),
-            ('repeat_password', "Повторите пароль"),
-            ('address', "Адрес доставки")
-        ]
+        registration = UserRegistration(
+            first_name=self.first_name_input.text(),
+            last_name=self.last_name_input.text(),
+            birth_date=self.birth_date_input.date().toString("yyyy-MM-dd"),
+            email=self.email_input.text(),
+            login=self.login_input_reg.text(),
+            password=self.password_input_reg.text(),
+            repeat_password=self.repeat_password_input.text(),
+            address=self.address_input.text()
+        )
         
-        empty_fields = []
-        for field, field_name in required_fields:
-            if not user_data[field].strip():
-                empty_fields.append(field_name)
+        empty_fields = [
+            field_name for field, field_name in _REQUIRED_FIELDS
+            if not getattr(registration, field).strip()
+        ]
         
         if empty_fields:
             QMessageBox.warning(
@@ -724,83 +1040,100 @@ class FoodDeliveryApp(QMainWindow):
             )
             return
         
-        success, message = self.user_system.register_user(user_data)
+        success, message = self.user_system.register_user(registration)
         if success:
             QMessageBox.information(self, "Успешно", message)
             self.show_login()
         else:
             QMessageBox.warning(self, "Ошибка регистрации", message)
 
-    def handle_search(self):
-        query = self.search_input.text().lower()
-        if not query:
-            self.search_results_label.hide()
-            self.search_results_list.hide()
-            self.search_results_list.clear()
-            return
-            
-        restaurants = self.db.load_restaurants()
-        results = []
-        
-        for restaurant in restaurants:
-            if query in restaurant['name'].lower():
-                results.append({
-                    'type': 'restaurant',
-                    'id': restaurant['id'],
-                    'name': restaurant['name'],
-                    'description': restaurant['description'],
-                    'rating': restaurant.get('rating', 4.5)
-                })
-            
-            for item in restaurant['menu']:
-                if query in item['name'].lower():
-                    results.append({
+    def _clear_search_ui(self):
+        self._last_query = None
+        self.search_results_label.hide()
+        self.search_results_list.hide()
+        self.search_results_model.set_rows([])
+
+    def _search_catalog(self, tokens):
+        matches = []
+        restaurants, candidates = self.db.search_candidates(tokens)
+        for i, j in candidates:
+            restaurant = restaurants[i]
+            if j < 0:
+                if all(token in restaurant['_haystack_lc'] for token in tokens):
+                    matches.append((restaurant['_haystack_lc'], {
+                        'type': 'restaurant',
+                        'id': restaurant['id'],
+                        'name': restaurant['name'],
+                        'description': restaurant['description'],
+                        'rating': restaurant.get('rating', 4.5),
+                        'display': restaurant['_display']
+                    }))
+            else:
+                item = restaurant['menu'][j]
+                if all(token in item['_haystack_lc'] for token in tokens):
+                    matches.append((item['_haystack_lc'], {
                         'type': 'dish',
                         'restaurant_id': restaurant['id'],
                         'restaurant_name': restaurant['name'],
                         'name': item['name'],
                         'description': item['description'],
-                        'price': item['price']
-                    })
+                        'price': item['price'],
+                        'display': item['_display']
+                    }))
+        return matches
+
+    def handle_search(self):
+        if not self.search_input.text().strip():
+            return self._clear_search_ui()
+        self.run_in_background(self._on_search_ready, self.db.load_restaurants)
+
+    def _on_search_ready(self, restaurants):
+        tokens = self.search_input.text().lower().split()
+        if not tokens or self.current_user is None:
+            return
+        
+        query = (tuple(tokens), self.db.restaurants_version)
+        if query == self._last_query:
+            return
+        self._last_query = query
+        
+        if self._search_cache_version != self.db.restaurants_version:
+            self._search_cache.clear()
+            self._search_cache_version = self.db.restaurants_version
+        
+        key = " ".join(tokens)
+        matches = self._search_cache.get(key)
+        if matches is None:
+            prefix = max((k for k in self._search_cache if key.startswith(k)), key=len, default=None)
+            if prefix is None:
+                matches = self._search_catalog(tokens)
+            else:
+                matches = [
+                    (haystack, result) for haystack, result in self._search_cache[prefix]
+                    if all(token in haystack for token in tokens)
+                ]
+            self._search_cache[key] = matches
+            if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        else:
+            self._search_cache.move_to_end(key)
         
-        self.search_subject.update_results(results)
+        self.search_subject.update_results([result for _, result in matches])
 
     def update(self, results):
         self.search_results_label.show()
         self.search_results_list.show()
-        self.search_results_list.clear()
         
         if not results:
-            self.search_results_list.addItem("Ничего не найдено")
+            self.search_results_model.set_rows([("Ничего не найдено", None)])
             return
             
-        for item in results:
-            if item['type'] == 'restaurant':
-                list_item = QListWidgetItem(
-                    f"🍴 Ресторан: {item['name']}\n"
-                    f"{item['description']}\n"
-                    f"Рейтинг: ★ {item['rating']}"
-                )
-                list_item.setData(Qt.ItemDataRole.UserRole, {
-                    'type': 'restaurant', 
-                    'id': item['id']
-                })
-            else:
-                list_item = QListWidgetItem(
-                    f"🍲 Блюдо: {item['name']} - {item['price']:.2f} ₽\n"
-                    f"Ресторан: {item['restaurant_name']}\n"
-                    f"{item['description']}"
-                )
-                list_item.setData(Qt.ItemDataRole.UserRole, {
-                    'type': 'dish', 
-                    'restaurant_id': item['restaurant_id']
-                })
-            
-            list_item.setSizeHint(QSize(100, 100))
-            self.search_results_list.addItem(list_item)
+        self.search_results_model.set_rows([(item['display'], item) for item in results])
 
-    def handle_search_result_click(self, item):
-        data = item.data(Qt.ItemDataRole.UserRole)
+    def handle_search_result_click(self, index):
+        data = index.data(Qt.ItemDataRole.UserRole)
+        if not data:
+            return
         if data['type'] == 'restaurant':
             self.show_restaurant_by_id(data['id'])
         else:
@@ -810,119 +1143,184 @@ class FoodDeliveryApp(QMainWindow):
         restaurant_id = item.data(Qt.ItemDataRole.UserRole)['id']
         self.show_restaurant_by_id(restaurant_id)
 
+    def get_restaurant(self, restaurant_id):
+        restaurants, version = self.db.restaurants_snapshot()
+        if self._restaurant_objs_version != version:
+            self._restaurant_objs = {}
+            self._menu_item_cache = {}
+            self._restaurant_objs_version = version
+        
+        restaurant = self._restaurant_objs.get(restaurant_id)
+        if restaurant is None:
+            restaurant_data = next((r for r in restaurants if r['id'] == restaurant_id), None)
+            if restaurant_data:
+                restaurant = Restaurant(restaurant_data)
+                self._restaurant_objs[restaurant_id] = restaurant
+        return restaurant
+
     def show_restaurant_by_id(self, restaurant_id):
-        restaurants = self.db.load_restaurants()
-        restaurant_data = next((r for r in restaurants if r['id'] == restaurant_id), None)
+        self._requested_restaurant_id = restaurant_id
+        self.run_in_background(self._on_restaurant_ready, self.db.load_restaurants)
+
+    def _on_restaurant_ready(self, restaurants):
+        restaurant_id = self._requested_restaurant_id
+        if restaurant_id is None or self.current_user is None:
+            return
+        self._requested_restaurant_id = None
+        restaurant = self.get_restaurant(restaurant_id)
         
-        if restaurant_data:
-            self.current_restaurant = Restaurant(restaurant_data)
+        if restaurant:
+            self.current_restaurant = restaurant
             self.restaurant_title.setText(self.current_restaurant.name)
+            self._pending_menu = {}
             self.menu_tabs.clear()
             
-            categories = {}
-            for item in self.current_restaurant.menu:
-                if item.category not in categories:
-                    categories[item.category] = []
-                categories[item.category].append(item)
-            
-            for category, items in categories.items():
-                tab = QWidget()
-                layout = QVBoxLayout()
-                
-                list_widget = QListWidget()
-                list_widget.setStyleSheet("font-size: 11pt;")
-                
-                for item in items:
-                    list_item = QListWidgetItem(
-                        f"{item.name} - {item.price:.2f} ₽\n"
-                        f"{item.description}"
-                    )
-                    list_item.setData(Qt.ItemDataRole.UserRole, {
+            categories = self._menu_item_cache.get(restaurant.id)
+            if categories is None:
+                categories = defaultdict(list)
+                for item in restaurant.menu:
+                    key = (restaurant.name, item.id)
+                    self._item_registry[key] = {
                         'id': item.id,
                         'name': item.name,
                         'price': item.price,
-                        'restaurant': self.current_restaurant.name
-                    })
-                    list_item.setSizeHint(QSize(100, 80))
-                    list_widget.addItem(list_item)
-                
-                list_widget.itemDoubleClicked.connect(self.add_to_cart)
-                layout.addWidget(list_widget)
-                tab.setLayout(layout)
+                        'restaurant': restaurant.name,
+                        '_display': f"{item.name} - {item.price:.2f} ₽\n{item.description}",
+                        '_cart_display': f"{item.name} - {item.price:.2f} ₽\nРесторан: {restaurant.name}"
+                    }
+                    categories[item.category].append(key)
+                self._menu_item_cache[restaurant.id] = categories
+            
+            for category, items in categories.items():
+                tab = QWidget()
+                tab.setLayout(QVBoxLayout())
+                self._pending_menu[self.menu_tabs.count()] = items
                 self.menu_tabs.addTab(tab, category)
+            self._populate_menu_tab(self.menu_tabs.currentIndex())
             
             self.stacked_widget.setCurrentWidget(self.restaurant_page)
 
+    def _populate_menu_tab(self, index):
+        items = self._pending_menu.pop(index, None)
+        if items is None:
+            return
+        
+        list_widget = QListWidget()
+        list_widget.setStyleSheet("font-size: 11pt;")
+        
+        for key in items:
+            list_item = QListWidgetItem(self._item_registry[key]['_display'])
+            list_item.setData(Qt.ItemDataRole.UserRole, key)
+            list_item.setSizeHint(_DEFAULT_MENU_SIZE)
+            list_widget.addItem(list_item)
+        
+        list_widget.itemDoubleClicked.connect(self.add_to_cart)
+        self.menu_tabs.widget(index).layout().addWidget(list_widget)
+
     def add_to_cart(self, item):
-        data = item.data(Qt.ItemDataRole.UserRole)
+        data = self._item_registry[item.data(Qt.ItemDataRole.UserRole)]
         self.cart.append(data)
-        QMessageBox.information(self, "Добавлено в корзину", f"{data['name']} добавлено в вашу корзину!")
-        self.update_cart()
+        self._cart_total += data['price']
+        self.statusBar().showMessage(f"{data['name']} добавлено в вашу корзину!", 1500)
+        if not self._cart_dirty:
+            self._cart_dirty = True
+            QTimer.singleShot(0, self._flush_cart)
+
+    def _flush_cart(self):
+        self._cart_dirty = False
+        for item in self.cart[self.cart_list.count():]:
+            self.cart_list.addItem(self._cart_list_item(item))
+        self.total_label.setText(f"Итого: {self._cart_total:.2f} ₽")
+
+    def _cart_list_item(self, item):
+        return QListWidgetItem(item['_cart_display'])
 
     def update_cart(self):
+        self.cart_list.setUpdatesEnabled(False)
+        self.cart_list.blockSignals(True)
+        try:
+            self.cart_list.clear()
+            for item in self.cart:
+                self.cart_list.addItem(self._cart_list_item(item))
+        finally:
+            self.cart_list.blockSignals(False)
+            self.cart_list.setUpdatesEnabled(True)
+        
+        self._cart_total = sum(item['price'] for item in self.cart)
+        self.total_label.setText(f"Итого: {self._cart_total:.2f} ₽")
+
+    def clear_cart(self):
+        self.cart = []
+        self._cart_total = 0.0
         self.cart_list.clear()
-        total = 0
-        
-        for item in self.cart:
-            list_item = QListWidgetItem(
-                f"{item['name']} - {item['price']:.2f} ₽\n"
-                f"Ресторан: {item['restaurant']}"
-            )
-            self.cart_list.addItem(list_item)
-            total += item['price']
-        
-        self.total_label.setText(f"Итого: {total:.2f} ₽")
+        self.total_label.setText(f"Итого: {self._cart_total:.2f} ₽")
 
     def show_order_confirmation(self):
         if not self.cart:
             QMessageBox.warning(self, "Корзина пуста", "Ваша корзина пуста!")
             return
             
-        summary = ""
-        total = 0
-        for item in self.cart:
-            summary += f"• {item['name']} - {item['price']:.2f} ₽\n"
-            total += item['price']
-        
-        summary += f"\nИтого: {total:.2f} ₽"
+        lines = [f"• {item['name']} - {item['price']:.2f} ₽" for item in self.cart]
+        lines.append(f"\nИтого: {self._cart_total:.2f} ₽")
         
-        self.order_summary.setText(summary)
+        self.order_summary.setText("\n".join(lines))
         self.delivery_address.setText(self.current_user.address)
         self.stacked_widget.setCurrentWidget(self.order_confirmation_page)
 
     def confirm_order(self):
+        if not self.cart or self._order_pending:
+            return
         payment_method = self.payment_combo.currentText()
         
         order = {
             'user': self.current_user.login,
             'date': datetime.now().strftime("%Y-%m-%d %H:%M"),
-            'items': self.cart,
+            'items': list(self.cart),
             'address': self.current_user.address,
             'payment_method': payment_method,
             'status': 'В обработке'
         }
         
-        orders = self.db.load_orders()
-        orders.append(order)
-        self.db.save_orders(orders)
-        
-        self.cart = []
-        
+        self._set_order_pending(True)
+        self.run_in_background(self._on_order_saved, self._save_order, order,
+                               on_failed=self._on_order_failed)
+
+    def _set_order_pending(self, pending):
+        self._order_pending = pending
+        self.order_confirmation_page.setEnabled(not pending)
+
+    def _save_order(self, order):
+        self.db.append_order(order)
+        return order
+
+    def _on_order_saved(self, order):
+        self._set_order_pending(False)
+        self.clear_cart()
         QMessageBox.information(self, "Заказ подтвержден", 
                                f"Ваш заказ успешно оформлен!\n"
-                               f"Способ оплаты: {payment_method}")
+                               f"Способ оплаты: {order['payment_method']}")
         self.show_main()
 
+    def _on_order_failed(self, message):
+        self._set_order_pending(False)
+        self.show_db_error(message)
+
     def show_login(self):
+        self._requested_restaurant_id = None
         self.stacked_widget.setCurrentWidget(self.login_page)
         self.login_input.clear()
         self.password_input.clear()
 
     def show_register(self):
+        self._requested_restaurant_id = None
         self.stacked_widget.setCurrentWidget(self.register_page)
         self.first_name_input.clear()
         self.last_name_input.clear()
-        self.birth_date_input.setDate(QDate.currentDate().addYears(-18))
+        today = QDate.currentDate()
+        if today != self._default_birth_day:
+            self._default_birth_day = today
+            self._default_birth = today.addYears(-18)
+        self.birth_date_input.setDate(self._default_birth)
         self.email_input.clear()
         self.login_input_reg.clear()
         self.password_input_reg.clear()
@@ -930,100 +1328,82 @@ class FoodDeliveryApp(QMainWindow):
         self.address_input.clear()
 
     def show_main(self):
+        self._requested_restaurant_id = None
         if self.current_user:
             self.welcome_label.setText(f"Добро пожаловать, {self.current_user.first_name}!")
             self.load_restaurants()
             self.search_input.clear()
-            self.search_results_label.hide()
-            self.search_results_list.hide()
+            self._clear_search_ui()
             self.stacked_widget.setCurrentWidget(self.main_page)
 
     def show_cart(self):
+        self._requested_restaurant_id = None
         self.update_cart()
         self.stacked_widget.setCurrentWidget(self.cart_page)
         
     def show_admin_page(self):
+        self._requested_restaurant_id = None
         self.stacked_widget.setCurrentWidget(self.admin_page)
 
     def logout(self):
         self.current_user = None
-        self.cart = []
+        self.clear_cart()
         self.show_login()
 
+    def run_in_background(self, on_finished, fn, *args, on_failed=None):
+        worker = DBWorker(fn, *args)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(on_failed or self.show_db_error)
+        QThreadPool.globalInstance().start(worker)
+
+    def show_db_error(self, message):
+        QMessageBox.warning(self, "Ошибка базы данных", message)
+
     def load_restaurants(self):
+        self.run_in_background(self._on_restaurants_loaded, self.db.load_restaurants)
+
+    def _on_restaurants_loaded(self, restaurants):
+        if self.current_user is None:
+            return
         self.restaurant_list.clear()
-        restaurants = self.db.load_restaurants()
         
         sort_index = self.sort_combo.currentIndex()
         if sort_index == 0:
-            context = SortContext(SortByName())
+            self.sort_context.set_strategy(SortByName())
         else:
-            context = SortContext(SortByRating())
+            self.sort_context.set_strategy(SortByRating())
         
-        sorted_restaurants = context.execute_sort(restaurants)
+        sorted_restaurants = self.sort_context.execute_sort(restaurants)
         
         for restaurant in sorted_restaurants:
-            widget = QWidget()
-            layout = QHBoxLayout()
-            layout.setContentsMargins(10, 10, 10, 10)
-            
-            icon_label = QLabel()
-            pixmap = QPixmap("restaurant_icon.png").scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio)
-            icon_label.setPixmap(pixmap)
-            icon_label.setFixedSize(80, 80)
-            
-            info_layout = QVBoxLayout()
-            name_label = QLabel(restaurant['name'])
-            name_label.setStyleSheet("font-weight: bold; font-size: 14pt;")
-            
-            desc_label = QLabel(restaurant['description'])
-            desc_label.setWordWrap(True)
-            desc_label.setStyleSheet("color: #555;")
-            
-            rating_label = QLabel(f"★ {restaurant.get('rating', 4.5)}")
-            rating_label.setStyleSheet("color: #FF9800; font-weight: bold;")
-            
-            info_layout.addWidget(name_label)
-            info_layout.addWidget(desc_label)
-            info_layout.addWidget(rating_label)
-            info_layout.addStretch()
-            
-            layout.addWidget(icon_label)
-            layout.addLayout(info_layout)
-            widget.setLayout(layout)
-            
-            # Create list item
-            list_item = QListWidgetItem()
+            list_item = QListWidgetItem(restaurant['name'])
             list_item.setSizeHint(QSize(100, 120))
             list_item.setData(Qt.ItemDataRole.UserRole, {'type': 'restaurant', 'id': restaurant['id']})
-            
+            list_item.setData(_DESCRIPTION_ROLE, restaurant['description'])
+            list_item.setData(_RATING_ROLE, restaurant['_rating_str'])
             self.restaurant_list.addItem(list_item)
-            self.restaurant_list.setItemWidget(list_item, widget)
 
 if __name__ == "__main__":
-    if not os.path.exists("restaurant_icon.png"):
-        from PIL import Image, ImageDraw
-        img = Image.new('RGB', (100, 100), color=(73, 109, 137))
-        d = ImageDraw.Draw(img)
-        d.rectangle([20, 20, 80, 80], fill=(255, 165, 0))
-        d.ellipse([30, 30, 70, 70], fill=(255, 255, 255))
-        img.save('restaurant_icon.png')
+    try:
+        os.stat("restaurant_icon.png")
+    except FileNotFoundError:
+        _write_placeholder_icon("restaurant_icon.png")
     
     db = Database()
-    users = db.load_users()
-    if not any(u.get('role') == 'admin' for u in users):
-        admin_user = {
-            "first_name": "Admin",
-            "last_name": "Admin",
-            "birth_date": "2000-01-01",
-            "email": "admin@example.com",
-            "login": "admin",
-            "password": "admin123",
-            "address": "Admin Office",
-            "role": "admin"
-        }
-        users.append(admin_user)
-        db.save_users(users)
+    if not os.path.exists(db.admin_seed_file):
+        if not any(u.get('role') == 'admin' for u in db.load_users()):
+            admin_user = {
+                "first_name": "Admin",
+                "last_name": "Admin",
+                "birth_date": "2000-01-01",
+                "email": "admin@example.com",
+                "login": "admin",
+                "password": _hash_password("admin123"),
+                "address": "Admin Office",
+                "role": "admin"
+            }
+            db.append_user(admin_user)
+        open(db.admin_seed_file, 'w').close()
 
     app = QApplication(sys.argv)
     window = FoodDeliveryApp()